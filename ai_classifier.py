@@ -1,46 +1,22 @@
+import asyncio
+import hashlib
+import faiss
+import numpy as np
 import openai
-import json
-import re
-from typing import Dict, List, Tuple
-from config import OPENAI_API_KEY, TOPIC_TAGS, SENTIMENT_OPTIONS, PRIORITY_LEVELS, DEFAULT_MODEL
+import orjson
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
+from config import (
+    OPENAI_API_KEY, TOPIC_TAGS, SENTIMENT_OPTIONS, PRIORITY_LEVELS, DEFAULT_MODEL,
+    MAX_CONCURRENT_REQUESTS, MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE, MAX_REQUEST_ATTEMPTS,
+    SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD, BATCH_COMPLETION_WINDOW,
+    TICKETS_PER_REQUEST, CLASSIFICATION_MAX_TOKENS
+)
+from embedding_utils import batch_for_embedding
+from parallel_processor import ParallelRequestProcessor
 
-class TicketClassifier:
-    def __init__(self):
-        if not OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY is required. Please set it in your environment variables.")
-        
-        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        self.model = DEFAULT_MODEL
-    
-    def classify_ticket(self, title: str, description: str) -> Dict:
-        try:
-            prompt = self._create_classification_prompt(title, description)
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert customer support ticket classifier for Atlan, a data catalog platform."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
-            
-            classification_text = response.choices[0].message.content
-            return self._parse_classification(classification_text)
-            
-        except Exception as e:
-            print(f"Error in classification: {e}")
-            return self._get_default_classification()
-    
-    def _create_classification_prompt(self, title: str, description: str) -> str:
-        return f"""
-Please classify the following customer support ticket for Atlan (a data catalog platform):
-
-Title: {title}
-Description: {description}
+_SYSTEM_PROMPT = """You are an expert customer support ticket classifier for Atlan, a data catalog platform.
 
-Classify this ticket according to the following criteria:
+Classify each customer support ticket you are given according to the following criteria:
 
 1. TOPIC TAGS (choose the most relevant one):
    - How-to: Questions about how to use features
@@ -65,31 +41,295 @@ Classify this ticket according to the following criteria:
    - P1 (Medium): Important issues that need attention but not immediately critical
    - P2 (Low): General questions, feature requests, or minor issues
 
-Please respond in the following JSON format:
-{{
+Unless instructed otherwise, respond with a JSON object in the following format:
+{
     "topic": "chosen_topic",
-    "sentiment": "chosen_sentiment", 
+    "sentiment": "chosen_sentiment",
     "priority": "chosen_priority",
     "reasoning": "brief explanation of your classification"
-}}
+}
 """
+
+CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topic": {"type": "string", "enum": TOPIC_TAGS},
+        "sentiment": {"type": "string", "enum": SENTIMENT_OPTIONS},
+        "priority": {"type": "string", "enum": PRIORITY_LEVELS},
+        "reasoning": {"type": "string"}
+    },
+    "required": ["topic", "sentiment", "priority", "reasoning"],
+    "additionalProperties": False
+}
+
+PACKED_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "classifications": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"id": {"type": "integer"}, **CLASSIFICATION_SCHEMA["properties"]},
+                "required": ["id"] + CLASSIFICATION_SCHEMA["required"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["classifications"],
+    "additionalProperties": False
+}
+
+class ClassificationStream:
+    def __init__(self, generator: Generator[str, None, Dict]):
+        self._generator = generator
+        self.classification: Optional[Dict] = None
     
-    def _parse_classification(self, classification_text: str) -> Dict:
+    def __iter__(self) -> Iterator[str]:
+        self.classification = yield from self._generator
+
+class TicketClassifier:
+    def __init__(self):
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY is required. Please set it in your environment variables.")
+        
+        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        self.model = DEFAULT_MODEL
+        self._cache: Dict[str, Dict] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self.semantic_cache_threshold = SEMANTIC_CACHE_THRESHOLD
+        self._semantic_cache_index = None
+        self._semantic_cache_entries: List[Dict] = []
+        self._semantic_cache_hits = 0
+    
+    def classify_ticket(self, title: str, description: str) -> Dict:
+        cache_key = self._get_cache_key(title, description)
+        cached = self._get_cached_classification(cache_key)
+        if cached is not None:
+            return cached
+        
+        cached, embedding = self._lookup_semantic_cache(cache_key, title, description)
+        if cached is not None:
+            return cached
+        
         try:
-            json_match = re.search(r'\{.*\}', classification_text, re.DOTALL)
-            if json_match:
-                classification = json.loads(json_match.group())
-                
-                if (classification.get("topic") in TOPIC_TAGS and 
-                    classification.get("sentiment") in SENTIMENT_OPTIONS and
-                    classification.get("priority") in PRIORITY_LEVELS):
-                    return classification
+            response = self.client.chat.completions.create(
+                **self._create_classification_request(title, description)
+            )
+            
+            classification_text = response.choices[0].message.content
+            return self._store_classification(cache_key, classification_text, embedding)
             
+        except Exception as e:
+            print(f"Error in classification: {e}")
             return self._get_default_classification()
+    
+    def classify_ticket_stream(self, title: str, description: str) -> "ClassificationStream":
+        return ClassificationStream(self._stream_classification(title, description))
+    
+    def _stream_classification(self, title: str, description: str) -> Generator[str, None, Dict]:
+        cache_key = self._get_cache_key(title, description)
+        cached = self._get_cached_classification(cache_key)
+        if cached is None:
+            cached, embedding = self._lookup_semantic_cache(cache_key, title, description)
+        
+        if cached is not None:
+            yield orjson.dumps(cached, option=orjson.OPT_INDENT_2).decode()
+            return cached
+        
+        classification_chunks = []
+        try:
+            stream = self.client.chat.completions.create(
+                stream=True,
+                **self._create_classification_request(title, description)
+            )
             
-        except (json.JSONDecodeError, AttributeError) as e:
-            print(f"Error parsing classification: {e}")
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    classification_chunks.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            print(f"Error in classification: {e}")
+            return self._get_default_classification()
+        
+        return self._store_classification(cache_key, "".join(classification_chunks), embedding)
+    
+    def get_cache_stats(self) -> Dict:
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._cache),
+            "semantic_hits": self._semantic_cache_hits,
+            "semantic_size": len(self._semantic_cache_entries)
+        }
+    
+    def _get_cache_key(self, title: str, description: str) -> str:
+        return hashlib.sha256(f"{self.model}|{title}|{description}".encode()).hexdigest()
+    
+    def _get_cached_classification(self, cache_key: str) -> Optional[Dict]:
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            self._cache_misses += 1
+            return None
+        
+        self._cache_hits += 1
+        return cached.copy()
+    
+    def _get_semantic_cache_text(self, title: str, description: str) -> str:
+        return f"{title} {description}"
+    
+    def _normalize_embeddings(self, response) -> np.ndarray:
+        embeddings = np.array(
+            [item.embedding for item in sorted(response.data, key=lambda d: d.index)],
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return embeddings / norms
+    
+    def _lookup_semantic_cache(self, cache_key: str, title: str, description: str) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        try:
+            response = self.client.embeddings.create(
+                model=SEMANTIC_CACHE_MODEL,
+                input=self._get_semantic_cache_text(title, description)
+            )
+            embedding = self._normalize_embeddings(response)[0]
+        except Exception as e:
+            print(f"Error in semantic cache lookup: {e}")
+            return None, None
+        
+        return self._get_semantic_cached_classification(cache_key, embedding), embedding
+    
+    def _get_semantic_cached_classification(self, cache_key: str, embedding: np.ndarray) -> Optional[Dict]:
+        if self._semantic_cache_index is None or self._semantic_cache_index.ntotal == 0:
+            return None
+        
+        similarities, indices = self._semantic_cache_index.search(embedding.reshape(1, -1), 1)
+        if indices[0][0] < 0 or similarities[0][0] < self.semantic_cache_threshold:
+            return None
+        
+        self._semantic_cache_hits += 1
+        classification = self._semantic_cache_entries[indices[0][0]]
+        self._cache[cache_key] = classification
+        return classification.copy()
+    
+    def _store_classification(self, cache_key: str, classification_text: str, embedding: Optional[np.ndarray] = None) -> Dict:
+        classification = self._parse_classification(classification_text)
+        if classification is None:
             return self._get_default_classification()
+        
+        return self._cache_classification(cache_key, classification, embedding)
+    
+    def _cache_classification(self, cache_key: str, classification: Dict, embedding: Optional[np.ndarray] = None) -> Dict:
+        self._cache[cache_key] = classification
+        
+        if embedding is not None:
+            if self._semantic_cache_index is None:
+                self._semantic_cache_index = faiss.IndexFlatIP(embedding.shape[0])
+            self._semantic_cache_index.add(embedding.reshape(1, -1))
+            self._semantic_cache_entries.append(classification)
+        
+        return classification.copy()
+    
+    def _create_classification_request(self, title: str, description: str) -> Dict:
+        prompt = self._create_classification_prompt(title, description)
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "ticket_classification", "strict": True, "schema": CLASSIFICATION_SCHEMA}
+            },
+            "temperature": 0.1,
+            "max_tokens": CLASSIFICATION_MAX_TOKENS
+        }
+    
+    def _create_packed_classification_request(self, tickets: List[Dict]) -> Dict:
+        prompt = self._create_packed_classification_prompt(tickets)
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "ticket_classifications", "strict": True, "schema": PACKED_CLASSIFICATION_SCHEMA}
+            },
+            "temperature": 0.1,
+            "max_tokens": CLASSIFICATION_MAX_TOKENS * len(tickets)
+        }
+    
+    def _create_packed_classification_prompt(self, tickets: List[Dict]) -> str:
+        ticket_list = "\n\n".join(
+            f"Ticket {ticket_id}:\nTitle: {ticket.get('title', '')}\nDescription: {ticket.get('description', '')}"
+            for ticket_id, ticket in enumerate(tickets, 1)
+        )
+        
+        return f"""
+Classify each of the following tickets:
+
+{ticket_list}
+
+Respond with a JSON object containing one entry per ticket, in the following format:
+{{
+    "classifications": [
+        {{
+            "id": ticket_number,
+            "topic": "chosen_topic",
+            "sentiment": "chosen_sentiment",
+            "priority": "chosen_priority",
+            "reasoning": "brief explanation of your classification"
+        }}
+    ]
+}}
+"""
+    
+    def _create_classification_prompt(self, title: str, description: str) -> str:
+        return f"Title: {title}\nDescription: {description}\nRespond in JSON."
+    
+    def _parse_classification(self, classification_text: str) -> Optional[Dict]:
+        try:
+            return self._validate_classification(orjson.loads(classification_text))
+            
+        except (orjson.JSONDecodeError, AttributeError, TypeError) as e:
+            print(f"Error parsing classification: {e}")
+            return None
+    
+    def _parse_packed_classifications(self, classification_text: str, count: int) -> Optional[List[Optional[Dict]]]:
+        try:
+            entries = orjson.loads(classification_text)["classifications"]
+            
+            classifications: List[Optional[Dict]] = [None] * count
+            for entry in entries:
+                position = int(entry.get("id")) - 1
+                if 0 <= position < count:
+                    classifications[position] = self._validate_classification(entry)
+            
+            return classifications
+            
+        except (orjson.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError) as e:
+            print(f"Error parsing packed classifications: {e}")
+            return None
+    
+    def _validate_classification(self, classification: Dict) -> Optional[Dict]:
+        if (classification.get("topic") in TOPIC_TAGS and 
+            classification.get("sentiment") in SENTIMENT_OPTIONS and
+            classification.get("priority") in PRIORITY_LEVELS):
+            return {
+                "topic": classification["topic"],
+                "sentiment": classification["sentiment"],
+                "priority": classification["priority"],
+                "reasoning": classification.get("reasoning", "")
+            }
+        
+        return None
     
     def _get_default_classification(self) -> Dict:
         return {
@@ -99,15 +339,279 @@ Please respond in the following JSON format:
             "reasoning": "Default classification due to parsing error"
         }
     
-    def classify_bulk_tickets(self, tickets: List[Dict]) -> List[Dict]:
-        classified_tickets = []
+    def classify_bulk_tickets(self, tickets: List[Dict], max_concurrent: int = MAX_CONCURRENT_REQUESTS) -> List[Dict]:
+        return asyncio.run(self.aclassify_bulk_tickets(tickets, max_concurrent))
+    
+    async def aclassify_bulk_tickets(self, tickets: List[Dict], max_concurrent: int = MAX_CONCURRENT_REQUESTS) -> List[Dict]:
+        classifications, pending = self._partition_by_cache(tickets)
+        await self._aclassify_pending(tickets, pending, classifications, max_concurrent)
+        return self._merge_classifications(tickets, classifications)
+    
+    async def _aclassify_pending(self, tickets: List[Dict], pending: Dict[str, List[int]],
+                                 classifications: List[Optional[Dict]],
+                                 max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+                                 embeddings: Optional[Dict[str, np.ndarray]] = None,
+                                 unresolved: Optional[List[Tuple[str, List[int]]]] = None) -> None:
+        if embeddings is None:
+            embeddings = await asyncio.to_thread(self._embed_pending, tickets, pending)
+            self._apply_semantic_cache_hits(pending, embeddings, classifications)
         
-        for ticket in tickets:
-            classification = self.classify_ticket(
-                ticket.get("title", ""),
-                ticket.get("description", "")
+        unresolved = list(unresolved or [])
+        async with openai.AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0) as client:
+            processor = ParallelRequestProcessor(
+                client,
+                max_requests_per_minute=MAX_REQUESTS_PER_MINUTE,
+                max_tokens_per_minute=MAX_TOKENS_PER_MINUTE,
+                max_concurrent=max_concurrent,
+                max_attempts=MAX_REQUEST_ATTEMPTS
             )
             
+            chunks = self._chunk_pending(pending)
+            responses = await processor.process([
+                self._create_packed_classification_request([tickets[indices[0]] for _, indices in chunk])
+                for chunk in chunks
+            ])
+            
+            for chunk, response in zip(chunks, responses):
+                if isinstance(response, Exception):
+                    print(f"Error in classification: {response}")
+                    for _, indices in chunk:
+                        for index in indices:
+                            classifications[index] = self._get_default_classification()
+                    continue
+                
+                unresolved.extend(self._apply_packed_classifications(
+                    chunk, response.choices[0].message.content, embeddings, classifications
+                ))
+            
+            responses = await processor.process([
+                self._create_classification_request(
+                    tickets[indices[0]].get("title", ""),
+                    tickets[indices[0]].get("description", "")
+                )
+                for _, indices in unresolved
+            ])
+        
+        for (cache_key, indices), response in zip(unresolved, responses):
+            if isinstance(response, Exception):
+                print(f"Error in classification: {response}")
+                classification = self._get_default_classification()
+            else:
+                classification = self._store_classification(
+                    cache_key, response.choices[0].message.content, embeddings.get(cache_key)
+                )
+            
+            for index in indices:
+                classifications[index] = classification.copy()
+    
+    def submit_classification_batch(self, tickets: List[Dict]) -> Dict:
+        classifications, pending = self._partition_by_cache(tickets)
+        
+        embeddings = self._embed_pending(tickets, pending)
+        self._apply_semantic_cache_hits(pending, embeddings, classifications)
+        chunks = self._chunk_pending(pending)
+        
+        job = {
+            "batch_id": None,
+            "status": "completed",
+            "tickets": tickets,
+            "classifications": classifications,
+            "chunks": chunks,
+            "embeddings": embeddings,
+            "processed_requests": 0,
+            "total_requests": len(chunks)
+        }
+        
+        if not chunks:
+            return job
+        
+        try:
+            batch_lines = [
+                orjson.dumps({
+                    "custom_id": str(custom_id),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._create_packed_classification_request(
+                        [tickets[indices[0]] for _, indices in chunk]
+                    )
+                })
+                for custom_id, chunk in enumerate(chunks)
+            ]
+            
+            batch_file = self.client.files.create(
+                file=("classification_batch.jsonl", b"\n".join(batch_lines)),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window=BATCH_COMPLETION_WINDOW
+            )
+            
+            job["batch_id"] = batch.id
+            job["status"] = batch.status
+            
+        except Exception as e:
+            print(f"Error submitting classification batch: {e}")
+            job["status"] = "failed"
+        
+        return job
+    
+    def poll_classification_batch(self, job: Dict) -> Optional[List[Dict]]:
+        tickets = job["tickets"]
+        classifications = job["classifications"]
+        
+        results: Dict[str, str] = {}
+        if job["batch_id"]:
+            try:
+                batch = self.client.batches.retrieve(job["batch_id"])
+            except Exception as e:
+                print(f"Error retrieving batch {job['batch_id']}: {e}")
+                return None
+            
+            job["status"] = batch.status
+            if batch.request_counts:
+                job["processed_requests"] = batch.request_counts.completed + batch.request_counts.failed
+                job["total_requests"] = batch.request_counts.total
+            
+            if batch.status not in ("completed", "failed", "expired", "cancelled"):
+                return None
+            
+            results = self._download_batch_results(batch)
+        
+        failed: Dict[str, List[int]] = {}
+        unresolved = []
+        for custom_id, chunk in enumerate(job["chunks"]):
+            classification_text = results.get(str(custom_id))
+            if classification_text is None:
+                failed.update(chunk)
+                continue
+            
+            unresolved.extend(self._apply_packed_classifications(
+                chunk, classification_text, job["embeddings"], classifications
+            ))
+        
+        if failed or unresolved:
+            asyncio.run(self._aclassify_pending(
+                tickets, failed, classifications,
+                embeddings=job["embeddings"], unresolved=unresolved
+            ))
+        
+        return self._merge_classifications(tickets, classifications)
+    
+    def _download_batch_results(self, batch) -> Dict[str, str]:
+        if not batch.output_file_id:
+            print(f"Batch {batch.id} finished with status '{batch.status}' and no output")
+            return {}
+        
+        results = {}
+        try:
+            output = self.client.files.content(batch.output_file_id).content
+        except Exception as e:
+            print(f"Error downloading output of batch {batch.id}: {e}")
+            return {}
+        
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            
+            try:
+                record = orjson.loads(line)
+                response = record.get("response")
+                if record.get("error") or not response or response.get("status_code") != 200:
+                    print(f"Error in batch classification for request {record.get('custom_id')}: {record.get('error')}")
+                    continue
+                
+                results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+                
+            except (orjson.JSONDecodeError, AttributeError, KeyError, IndexError, TypeError) as e:
+                print(f"Error parsing output of batch {batch.id}: {e}")
+        
+        return results
+    
+    def _embed_pending(self, tickets: List[Dict], pending: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+        embeddings: Dict[str, np.ndarray] = {}
+        pending_keys = list(pending.keys())
+        texts = self._get_pending_texts(tickets, pending)
+        
+        for batch_indices in batch_for_embedding(texts, SEMANTIC_CACHE_MODEL):
+            try:
+                response = self.client.embeddings.create(
+                    model=SEMANTIC_CACHE_MODEL,
+                    input=[texts[i] for i in batch_indices]
+                )
+                embeddings.update(zip(
+                    [pending_keys[i] for i in batch_indices],
+                    self._normalize_embeddings(response)
+                ))
+            except Exception as e:
+                print(f"Error in semantic cache lookup for batch of {len(batch_indices)} tickets: {e}")
+        
+        return embeddings
+    
+    def _get_pending_texts(self, tickets: List[Dict], pending: Dict[str, List[int]]) -> List[str]:
+        return [
+            self._get_semantic_cache_text(
+                tickets[indices[0]].get("title", ""),
+                tickets[indices[0]].get("description", "")
+            )
+            for indices in pending.values()
+        ]
+    
+    def _apply_semantic_cache_hits(self, pending: Dict[str, List[int]], embeddings: Dict[str, np.ndarray],
+                                   classifications: List[Optional[Dict]]) -> None:
+        for cache_key, embedding in embeddings.items():
+            cached = self._get_semantic_cached_classification(cache_key, embedding)
+            if cached is not None:
+                for index in pending.pop(cache_key):
+                    classifications[index] = cached.copy()
+    
+    def _chunk_pending(self, pending: Dict[str, List[int]]) -> List[List[Tuple[str, List[int]]]]:
+        pending_items = list(pending.items())
+        return [
+            pending_items[start:start + TICKETS_PER_REQUEST]
+            for start in range(0, len(pending_items), TICKETS_PER_REQUEST)
+        ]
+    
+    def _apply_packed_classifications(self, chunk: List[Tuple[str, List[int]]], classification_text: str,
+                                      embeddings: Dict[str, np.ndarray],
+                                      classifications: List[Optional[Dict]]) -> List[Tuple[str, List[int]]]:
+        packed = self._parse_packed_classifications(classification_text, len(chunk))
+        
+        unresolved = []
+        for position, (cache_key, indices) in enumerate(chunk):
+            classification = packed[position] if packed else None
+            if classification is None:
+                unresolved.append((cache_key, indices))
+                continue
+            
+            classification = self._cache_classification(cache_key, classification, embeddings.get(cache_key))
+            for index in indices:
+                classifications[index] = classification.copy()
+        
+        return unresolved
+    
+    def _partition_by_cache(self, tickets: List[Dict]) -> Tuple[List[Optional[Dict]], Dict[str, List[int]]]:
+        classifications: List[Optional[Dict]] = [None] * len(tickets)
+        pending: Dict[str, List[int]] = {}
+        
+        for index, ticket in enumerate(tickets):
+            cache_key = self._get_cache_key(ticket.get("title", ""), ticket.get("description", ""))
+            if cache_key in pending:
+                pending[cache_key].append(index)
+                continue
+            
+            cached = self._get_cached_classification(cache_key)
+            if cached is not None:
+                classifications[index] = cached
+            else:
+                pending[cache_key] = [index]
+        
+        return classifications, pending
+    
+    def _merge_classifications(self, tickets: List[Dict], classifications: List[Dict]) -> List[Dict]:
+        classified_tickets = []
+        for ticket, classification in zip(tickets, classifications):
             classified_ticket = ticket.copy()
             classified_ticket.update(classification)
             classified_tickets.append(classified_ticket)
@@ -128,4 +632,4 @@ if __name__ == "__main__":
     )
     
     print("Classification Result:")
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
@@ -1,14 +1,16 @@
 import streamlit as st
-import json
+import orjson
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from functools import lru_cache
 import time
+import asyncio
 
 from ai_classifier import TicketClassifier
 from knowledge_base import KnowledgeBase
-from config import TOPIC_TAGS, SENTIMENT_OPTIONS, PRIORITY_LEVELS
+from config import TOPIC_TAGS, SENTIMENT_OPTIONS, PRIORITY_LEVELS, BATCH_POLL_INTERVAL
 
 st.set_page_config(
     page_title="Atlan Customer Support Copilot",
@@ -78,16 +80,24 @@ if 'knowledge_base' not in st.session_state:
     st.session_state.knowledge_base = None
 if 'classifier' not in st.session_state:
     st.session_state.classifier = None
+if 'classification_batch' not in st.session_state:
+    st.session_state.classification_batch = None
 
 @st.cache_data
 def load_sample_tickets():
     try:
-        with open('sample_tickets.json', 'r') as f:
-            return json.load(f)
+        with open('sample_tickets.json', 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         st.error("Sample tickets file not found!")
         return []
 
+@st.cache_resource
+def load_knowledge_base():
+    knowledge_base = KnowledgeBase()
+    knowledge_base.load_cache()
+    return knowledge_base
+
 def initialize_ai_components():
     if st.session_state.classifier is None:
         try:
@@ -100,13 +110,14 @@ def initialize_ai_components():
     if st.session_state.knowledge_base is None:
         try:
             with st.spinner("Initializing knowledge base..."):
-                st.session_state.knowledge_base = KnowledgeBase()
+                st.session_state.knowledge_base = load_knowledge_base()
         except Exception as e:
             st.error(f"Failed to initialize knowledge base: {e}")
             return False
     
     return True
 
+@lru_cache(maxsize=256)
 def get_badge_class(topic, sentiment, priority):
     topic_class = f"topic-{topic.lower().replace('/', '').replace(' ', '')}"
     sentiment_class = f"sentiment-{sentiment.lower()}"
@@ -114,76 +125,76 @@ def get_badge_class(topic, sentiment, priority):
     
     return topic_class, sentiment_class, priority_class
 
-def display_ticket_classification(ticket):
+def render_ticket_html(ticket):
     topic_class, sentiment_class, priority_class = get_badge_class(
         ticket.get('topic', 'Unknown'),
         ticket.get('sentiment', 'Unknown'),
         ticket.get('priority', 'Unknown')
     )
     
-    st.markdown(f"""
+    return f"""
     <div class="ticket-card">
         <h4>Ticket #{ticket['id']}: {ticket['title']}</h4>
         <p><strong>Customer:</strong> {ticket['customer_email']}</p>
         <p><strong>Description:</strong> {ticket['description']}</p>
         <p><strong>Created:</strong> {ticket['created_at']}</p>
-        
         <div style="margin-top: 1rem;">
             <span class="classification-badge {topic_class}">Topic: {ticket.get('topic', 'Unknown')}</span>
             <span class="classification-badge {sentiment_class}">Sentiment: {ticket.get('sentiment', 'Unknown')}</span>
             <span class="classification-badge {priority_class}">Priority: {ticket.get('priority', 'Unknown')}</span>
         </div>
-        
         {f"<p><strong>AI Reasoning:</strong> {ticket.get('reasoning', 'No reasoning provided')}</p>" if ticket.get('reasoning') else ""}
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+@st.cache_data
+def render_tickets_html(tickets):
+    return "".join(render_ticket_html(ticket) for ticket in tickets)
 
 def create_classification_dashboard(classified_tickets):
     st.markdown('<div class="section-header">📊 Classification Dashboard</div>', unsafe_allow_html=True)
     
+    df = pd.DataFrame(classified_tickets)
+    for column in ('topic', 'sentiment', 'priority'):
+        df[column] = df[column].fillna('Unknown') if column in df else 'Unknown'
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Tickets", len(classified_tickets))
+        st.metric("Total Tickets", len(df))
     
     with col2:
-        high_priority = len([t for t in classified_tickets if t.get('priority') == 'P0 (High)'])
+        high_priority = int((df['priority'] == 'P0 (High)').sum())
         st.metric("High Priority", high_priority)
     
     with col3:
-        frustrated = len([t for t in classified_tickets if t.get('sentiment') == 'Frustrated'])
+        frustrated = int((df['sentiment'] == 'Frustrated').sum())
         st.metric("Frustrated Customers", frustrated)
     
     with col4:
-        howto_tickets = len([t for t in classified_tickets if t.get('topic') == 'How-to'])
+        howto_tickets = int((df['topic'] == 'How-to').sum())
         st.metric("How-to Questions", howto_tickets)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        topic_counts = {}
-        for ticket in classified_tickets:
-            topic = ticket.get('topic', 'Unknown')
-            topic_counts[topic] = topic_counts.get(topic, 0) + 1
+        topic_counts = df['topic'].value_counts()
         
-        if topic_counts:
+        if not topic_counts.empty:
             fig_topic = px.pie(
-                values=list(topic_counts.values()),
-                names=list(topic_counts.keys()),
+                values=topic_counts.values,
+                names=topic_counts.index,
                 title="Topic Distribution"
             )
             st.plotly_chart(fig_topic, use_container_width=True)
     
     with col2:
-        priority_counts = {}
-        for ticket in classified_tickets:
-            priority = ticket.get('priority', 'Unknown')
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
+        priority_counts = df['priority'].value_counts()
         
-        if priority_counts:
+        if not priority_counts.empty:
             fig_priority = px.bar(
-                x=list(priority_counts.keys()),
-                y=list(priority_counts.values()),
+                x=priority_counts.index,
+                y=priority_counts.values,
                 title="Priority Distribution"
             )
             st.plotly_chart(fig_priority, use_container_width=True)
@@ -201,18 +212,20 @@ def create_classification_dashboard(classified_tickets):
     with col3:
         selected_priority = st.selectbox("Filter by Priority", ["All"] + PRIORITY_LEVELS)
     
-    filtered_tickets = classified_tickets
+    mask = pd.Series(True, index=df.index)
     if selected_topic != "All":
-        filtered_tickets = [t for t in filtered_tickets if t.get('topic') == selected_topic]
+        mask &= df['topic'] == selected_topic
     if selected_sentiment != "All":
-        filtered_tickets = [t for t in filtered_tickets if t.get('sentiment') == selected_sentiment]
+        mask &= df['sentiment'] == selected_sentiment
     if selected_priority != "All":
-        filtered_tickets = [t for t in filtered_tickets if t.get('priority') == selected_priority]
+        mask &= df['priority'] == selected_priority
+    
+    filtered_tickets = [classified_tickets[i] for i in df.index[mask]]
     
     st.write(f"Showing {len(filtered_tickets)} tickets")
     
-    for ticket in filtered_tickets:
-        display_ticket_classification(ticket)
+    if filtered_tickets:
+        st.markdown(render_tickets_html(filtered_tickets), unsafe_allow_html=True)
 
 def handle_interactive_agent():
     st.markdown('<div class="section-header">🤖 Interactive AI Agent</div>', unsafe_allow_html=True)
@@ -234,14 +247,18 @@ def handle_interactive_agent():
             st.error("Failed to initialize AI components. Please check your configuration.")
             return
         
-        with st.spinner("Analyzing ticket..."):
-            classification = st.session_state.classifier.classify_ticket(
-                title="New Ticket",
-                description=new_ticket
-            )
-        
         st.markdown("### 🔍 Internal Analysis (Back-end View)")
         
+        classification_stream = st.session_state.classifier.classify_ticket_stream(
+            title="New Ticket",
+            description=new_ticket
+        )
+        
+        with st.expander("Model output", expanded=True):
+            st.write_stream(classification_stream)
+        
+        classification = classification_stream.classification
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
@@ -304,21 +321,63 @@ def main():
         st.markdown("### 📋 Bulk Ticket Classification Dashboard")
         st.write("This dashboard shows the AI classification of sample support tickets.")
         
+        use_batch_api = st.checkbox(
+            "Use OpenAI Batch API (50% cheaper, results may take longer)",
+            value=True
+        )
+        
         if st.button("Load and Classify Tickets", type="primary"):
             if not initialize_ai_components():
                 st.error("Failed to initialize AI components. Please check your configuration.")
                 return
             
-            with st.spinner("Classifying tickets..."):
-                classified_tickets = st.session_state.classifier.classify_bulk_tickets(
-                    st.session_state.sample_tickets
-                )
+            if use_batch_api:
+                with st.spinner("Submitting classification batch..."):
+                    st.session_state.classification_batch = st.session_state.classifier.submit_classification_batch(
+                        st.session_state.sample_tickets
+                    )
+            else:
+                with st.spinner("Classifying tickets..."):
+                    classified_tickets = asyncio.run(
+                        st.session_state.classifier.aclassify_bulk_tickets(
+                            st.session_state.sample_tickets
+                        )
+                    )
+                
                 st.session_state.classified_tickets = classified_tickets
-            
-            st.success(f"Successfully classified {len(classified_tickets)} tickets!")
+                
+                st.success(f"Successfully classified {len(classified_tickets)} tickets!")
+        
+        batch_pending = False
+        batch_job = st.session_state.classification_batch
+        if batch_job is not None and initialize_ai_components():
+            try:
+                classified_tickets = st.session_state.classifier.poll_classification_batch(batch_job)
+            except Exception as e:
+                st.session_state.classification_batch = None
+                st.error(f"Failed to collect classification batch: {e}")
+            else:
+                if classified_tickets is None:
+                    batch_pending = True
+                    done = batch_job["processed_requests"]
+                    total = batch_job["total_requests"]
+                    st.progress(
+                        done / total if total else 0.0,
+                        text=f"Batch {batch_job['status']}: {done}/{total} requests processed"
+                    )
+                    st.info(f"Checking the batch again in {BATCH_POLL_INTERVAL} seconds. You can keep using the app meanwhile.")
+                else:
+                    st.session_state.classification_batch = None
+                    st.session_state.classified_tickets = classified_tickets
+                    
+                    st.success(f"Successfully classified {len(classified_tickets)} tickets!")
         
         if st.session_state.classified_tickets:
             create_classification_dashboard(st.session_state.classified_tickets)
+        
+        if batch_pending:
+            time.sleep(BATCH_POLL_INTERVAL)
+            st.rerun()
     
     elif page == "Interactive AI Agent":
         handle_interactive_agent()
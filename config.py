@@ -1,14 +1,39 @@
 import os
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-DEFAULT_MODEL = "gpt-3.5-turbo"
+DEFAULT_MODEL = "gpt-4o-mini"
+CLASSIFICATION_MAX_TOKENS = 150
 EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_BATCH_SIZE = 96
+EMBEDDING_MAX_BATCH_TOKENS = 100000
+MAX_CONCURRENT_REQUESTS = 5
+MAX_REQUESTS_PER_MINUTE = 3500
+MAX_TOKENS_PER_MINUTE = 90000
+MAX_REQUEST_ATTEMPTS = 5
+SEMANTIC_CACHE_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+TICKETS_PER_REQUEST = 10
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = 30
+KB_IVF_NLIST = 64
+KB_IVF_NPROBE = 8
+KB_PQ_SUBQUANTIZERS = 48
+KB_PQ_NBITS = 8
+KB_CACHE_PATH = "kb_cache.npz"
 
 KNOWLEDGE_BASE_URLS = {
     "docs": "https://docs.atlan.com",
     "developer": "https://developer.atlan.com"
 }
 
+SCRAPE_MAX_CONCURRENT = 5
+SCRAPE_TIMEOUT = 10
+SCRAPE_USER_AGENT = "AtlanSupportBot/1.0"
+SCRAPE_POOL_SIZE = 20
+SCRAPE_POOL_SIZE_PER_HOST = 10
+SCRAPE_MAX_RETRIES = 3
+SCRAPE_BACKOFF_FACTOR = 0.5
+
 TOPIC_TAGS = [
     "How-to",
     "Product", 
@@ -0,0 +1,30 @@
+import tiktoken
+from typing import List
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_MAX_BATCH_TOKENS
+
+def batch_for_embedding(texts: List[str], model: str) -> List[List[int]]:
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    
+    batches = []
+    batch = []
+    batch_tokens = 0
+    
+    for index, text in enumerate(texts):
+        num_tokens = len(encoding.encode(text))
+        
+        if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or
+                      batch_tokens + num_tokens > EMBEDDING_MAX_BATCH_TOKENS):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        
+        batch.append(index)
+        batch_tokens += num_tokens
+    
+    if batch:
+        batches.append(batch)
+    
+    return batches
@@ -1,12 +1,72 @@
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
+import hashlib
+import os
+from selectolax.lexbor import LexborHTMLParser
 import openai
 import json
+import faiss
+import numpy as np
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import time
-from config import OPENAI_API_KEY, KNOWLEDGE_BASE_URLS, EMBEDDING_MODEL
+from config import (
+    OPENAI_API_KEY, KNOWLEDGE_BASE_URLS, EMBEDDING_MODEL,
+    SCRAPE_MAX_CONCURRENT, SCRAPE_TIMEOUT, SCRAPE_USER_AGENT, SCRAPE_POOL_SIZE, SCRAPE_POOL_SIZE_PER_HOST,
+    SCRAPE_MAX_RETRIES, SCRAPE_BACKOFF_FACTOR, KB_CACHE_PATH,
+    KB_IVF_NLIST, KB_IVF_NPROBE, KB_PQ_SUBQUANTIZERS, KB_PQ_NBITS
+)
+from embedding_utils import batch_for_embedding
+
+_CONTENT_SELECTORS = (
+    'main', 'article', '.content', '.documentation',
+    '.docs-content', '#content', '.page-content'
+)
+_SKIP_PATTERNS = ('.pdf', '.zip', '.jpg', '.png', '.gif', '/api/', '/search')
+_WHITESPACE_RE = re.compile(r'\s+')
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def _use_ivfpq(num_docs: int, dim: int) -> bool:
+    return num_docs >= max(KB_IVF_NLIST, 2 ** KB_PQ_NBITS) * 39 and dim % KB_PQ_SUBQUANTIZERS == 0
+
+def _extract_links(html: bytes) -> List[str]:
+    tree = LexborHTMLParser(html)
+    return [link.attributes['href'] for link in tree.css('a[href]') if link.attributes.get('href')]
+
+def _parse_page(url: str, html: bytes) -> Optional[Dict]:
+    tree = LexborHTMLParser(html)
+    
+    for script in tree.css('script, style'):
+        script.decompose()
+    
+    title = tree.css_first('title')
+    title_text = title.text().strip() if title else "Untitled"
+    
+    content_text = ""
+    for selector in _CONTENT_SELECTORS:
+        content_elem = tree.css_first(selector)
+        if content_elem:
+            content_text = content_elem.text(deep=True, separator=' ').strip()
+            break
+    
+    if not content_text:
+        body = tree.body
+        if body:
+            content_text = body.text(deep=True, separator=' ').strip()
+    
+    content_text = _WHITESPACE_RE.sub(' ', content_text)
+    content_text = content_text[:2000]
+    
+    if content_text and len(content_text) > 100:
+        return {
+            'url': url,
+            'title': title_text,
+            'content': content_text,
+            'scraped_at': time.time()
+        }
+    
+    return None
 
 class KnowledgeBase:
     def __init__(self):
@@ -16,41 +76,70 @@ class KnowledgeBase:
         self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
         self.embedding_model = EMBEDDING_MODEL
         self.knowledge_base = {}
-        self.embeddings = {}
+        self.documents = []
+        self._pending_embeddings = []
+        self._index = None
     
     def scrape_documentation(self, base_url: str, max_pages: int = 10) -> List[Dict]:
+        return asyncio.run(self._scrape_sites([base_url], max_pages))[0]
+    
+    async def _scrape_sites(self, base_urls: List[str], max_pages: int) -> List[List[Dict]]:
+        semaphore = asyncio.Semaphore(SCRAPE_MAX_CONCURRENT)
+        
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=SCRAPE_POOL_SIZE, limit_per_host=SCRAPE_POOL_SIZE_PER_HOST),
+            headers={'Accept-Encoding': 'gzip, deflate', 'User-Agent': SCRAPE_USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=SCRAPE_TIMEOUT)
+        ) as session:
+            return await asyncio.gather(*[
+                self._ascrape_documentation(session, semaphore, base_url, max_pages)
+                for base_url in base_urls
+            ])
+    
+    async def _ascrape_documentation(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                     base_url: str, max_pages: int) -> List[Dict]:
         scraped_content = []
-        visited_urls = set()
         
         try:
-            response = requests.get(base_url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            html = await self._fetch(session, semaphore, base_url)
+            hrefs = _extract_links(html)
             
             doc_links = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
+            for href in hrefs:
                 full_url = urljoin(base_url, href)
                 
                 if (self._is_doc_page(full_url, base_url) and 
-                    full_url not in visited_urls and 
+                    full_url not in doc_links and 
                     len(doc_links) < max_pages):
                     doc_links.append(full_url)
             
-            for url in doc_links[:max_pages]:
-                if url not in visited_urls:
-                    content = self._scrape_page(url)
-                    if content:
-                        scraped_content.append(content)
-                        visited_urls.add(url)
-                    time.sleep(1)
+            pages = await asyncio.gather(*[
+                self._ascrape_page(session, semaphore, url)
+                for url in doc_links
+            ])
+            scraped_content = [page for page in pages if page]
             
         except Exception as e:
             print(f"Error scraping {base_url}: {e}")
         
         return scraped_content
     
+    async def _fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> bytes:
+        for attempt in range(SCRAPE_MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(SCRAPE_BACKOFF_FACTOR * 2 ** (attempt - 1))
+            
+            try:
+                async with semaphore:
+                    async with session.get(url) as response:
+                        if response.status not in _RETRY_STATUSES or attempt == SCRAPE_MAX_RETRIES:
+                            response.raise_for_status()
+                            return await response.read()
+                
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == SCRAPE_MAX_RETRIES:
+                    raise
+    
     def _is_doc_page(self, url: str, base_url: str) -> bool:
         parsed_url = urlparse(url)
         parsed_base = urlparse(base_url)
@@ -58,78 +147,149 @@ class KnowledgeBase:
         if parsed_url.netloc != parsed_base.netloc:
             return False
         
-        skip_patterns = ['.pdf', '.zip', '.jpg', '.png', '.gif', '/api/', '/search']
-        for pattern in skip_patterns:
-            if pattern in url.lower():
+        url_lower = url.lower()
+        for pattern in _SKIP_PATTERNS:
+            if pattern in url_lower:
                 return False
         
         return True
     
-    def _scrape_page(self, url: str) -> Dict:
+    async def _ascrape_page(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                            url: str) -> Optional[Dict]:
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "Untitled"
-            
-            content_selectors = [
-                'main', 'article', '.content', '.documentation', 
-                '.docs-content', '#content', '.page-content'
-            ]
-            
-            content_text = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content_text = content_elem.get_text().strip()
-                    break
-            
-            if not content_text:
-                body = soup.find('body')
-                if body:
-                    content_text = body.get_text().strip()
-            
-            content_text = re.sub(r'\s+', ' ', content_text)
-            content_text = content_text[:2000]
-            
-            if content_text and len(content_text) > 100:
-                return {
-                    'url': url,
-                    'title': title_text,
-                    'content': content_text,
-                    'scraped_at': time.time()
-                }
+            html = await self._fetch(session, semaphore, url)
+            return _parse_page(url, html)
             
         except Exception as e:
             print(f"Error scraping page {url}: {e}")
         
         return None
     
-    def create_embeddings(self, content_list: List[Dict]) -> None:
+    def create_embeddings(self, content_list: List[Dict], stored_embeddings: Optional[Dict[str, np.ndarray]] = None) -> None:
+        stored_embeddings = stored_embeddings or {}
+        
+        to_embed = []
         for item in content_list:
+            embedding = stored_embeddings.get(self._get_content_hash(item['content']))
+            if embedding is not None:
+                self._add_document(item, embedding)
+            else:
+                to_embed.append(item)
+        
+        for batch_indices in batch_for_embedding([item['content'] for item in to_embed], self.embedding_model):
+            batch = [to_embed[i] for i in batch_indices]
             try:
                 response = self.client.embeddings.create(
                     model=self.embedding_model,
-                    input=item['content']
+                    input=[item['content'] for item in batch]
                 )
                 
-                self.embeddings[item['url']] = {
-                    'embedding': response.data[0].embedding,
-                    'content': item['content'],
-                    'title': item['title']
-                }
+                for item, data in zip(batch, sorted(response.data, key=lambda d: d.index)):
+                    self._add_document(item, data.embedding)
                 
             except Exception as e:
-                print(f"Error creating embedding for {item['url']}: {e}")
+                print(f"Error creating embeddings for batch of {len(batch)} documents: {e}")
+        
+        self._rebuild_index()
+    
+    def _add_document(self, item: Dict, embedding) -> None:
+        self._pending_embeddings.append(np.asarray(embedding, dtype=np.float32))
+        self.documents.append({
+            'url': item['url'],
+            'content': item['content'],
+            'title': item['title']
+        })
+    
+    def _get_content_hash(self, content: str) -> str:
+        return hashlib.sha256(f"{self.embedding_model}|{content}".encode()).hexdigest()
+    
+    def save_cache(self, path: str = KB_CACHE_PATH) -> None:
+        if self._index is None:
+            return
+        
+        np.savez_compressed(
+            path,
+            urls=np.array([doc['url'] for doc in self.documents]),
+            titles=np.array([doc['title'] for doc in self.documents]),
+            contents=np.array([doc['content'] for doc in self.documents]),
+            index=faiss.serialize_index(self._index)
+        )
+    
+    def load_cache(self, path: str = KB_CACHE_PATH) -> bool:
+        if not os.path.exists(path):
+            return False
+        
+        try:
+            with np.load(path) as cache:
+                urls, titles, contents = cache['urls'], cache['titles'], cache['contents']
+                index = faiss.deserialize_index(cache['index'])
+        except Exception as e:
+            print(f"Error loading knowledge base cache {path}: {e}")
+            return False
+        
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = KB_IVF_NPROBE
+        
+        self.documents = [
+            {'url': str(url), 'title': str(title), 'content': str(content)}
+            for url, title, content in zip(urls, titles, contents)
+        ]
+        self._pending_embeddings = []
+        self._index = index
+        
+        return True
+    
+    def _get_stored_embeddings(self) -> Dict[str, np.ndarray]:
+        if self._index is None:
+            return {}
+        
+        if isinstance(self._index, faiss.IndexIVF):
+            self._index.make_direct_map()
+        
+        embeddings = self._index.reconstruct_n(0, self._index.ntotal)
+        return {
+            self._get_content_hash(doc['content']): embedding
+            for doc, embedding in zip(self.documents, embeddings)
+        }
+    
+    def _rebuild_index(self) -> None:
+        if not self._pending_embeddings:
+            return
+        
+        new_embeddings = np.vstack(self._pending_embeddings)
+        self._pending_embeddings = []
+        
+        norms = np.linalg.norm(new_embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        new_embeddings /= norms
+        
+        if self._index is None:
+            self._index = self._build_index(new_embeddings)
+        elif isinstance(self._index, faiss.IndexFlat) and _use_ivfpq(self._index.ntotal + len(new_embeddings), self._index.d):
+            existing = self._index.reconstruct_n(0, self._index.ntotal)
+            self._index = self._build_index(np.vstack([existing, new_embeddings]))
+        else:
+            self._index.add(new_embeddings)
+    
+    def _build_index(self, matrix: np.ndarray):
+        num_docs, dim = matrix.shape
+        
+        if not _use_ivfpq(num_docs, dim):
+            index = faiss.IndexFlatIP(dim)
+            index.add(matrix)
+            return index
+        
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(
+            quantizer, dim, KB_IVF_NLIST, KB_PQ_SUBQUANTIZERS, KB_PQ_NBITS, faiss.METRIC_INNER_PRODUCT
+        )
+        index.nprobe = KB_IVF_NPROBE
+        index.train(matrix)
+        index.add(matrix)
+        return index
     
     def search_relevant_content(self, query: str, top_k: int = 3) -> List[Dict]:
-        if not self.embeddings:
+        if self._index is None:
             return []
         
         try:
@@ -137,40 +297,30 @@ class KnowledgeBase:
                 model=self.embedding_model,
                 input=query
             )
-            query_embedding = query_response.data[0].embedding
+            query_embedding = np.asarray(query_response.data[0].embedding, dtype=np.float32)
+            
+            query_norm = np.linalg.norm(query_embedding)
+            if query_norm == 0:
+                return []
             
-            similarities = []
-            for url, data in self.embeddings.items():
-                similarity = self._cosine_similarity(query_embedding, data['embedding'])
-                similarities.append({
-                    'url': url,
-                    'title': data['title'],
-                    'content': data['content'],
-                    'similarity': similarity
-                })
+            query_embedding = (query_embedding / query_norm).reshape(1, -1)
+            similarities, indices = self._index.search(query_embedding, min(top_k, self._index.ntotal))
             
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
-            return similarities[:top_k]
+            return [
+                {
+                    'url': self.documents[i]['url'],
+                    'title': self.documents[i]['title'],
+                    'content': self.documents[i]['content'],
+                    'similarity': float(similarity)
+                }
+                for similarity, i in zip(similarities[0], indices[0])
+                if i >= 0
+            ]
             
         except Exception as e:
             print(f"Error searching content: {e}")
             return []
     
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        import numpy as np
-        
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0
-        
-        return dot_product / (norm1 * norm2)
-    
     def generate_answer(self, query: str, topic: str) -> Dict:
         relevant_content = self.search_relevant_content(query, top_k=3)
         
@@ -227,23 +377,32 @@ Answer:
                 'sources': []
             }
     
-    def initialize_knowledge_base(self) -> None:
+    def initialize_knowledge_base(self, refresh: bool = False) -> None:
         print("Initializing knowledge base...")
         
+        if self.load_cache() and not refresh:
+            print(f"Knowledge base loaded from {KB_CACHE_PATH} with {len(self.documents)} documents.")
+            return
+        
+        stored_embeddings = self._get_stored_embeddings()
+        self.documents = []
+        self._pending_embeddings = []
+        self._index = None
+        
         all_content = []
         
-        print("Scraping Atlan documentation...")
-        docs_content = self.scrape_documentation(KNOWLEDGE_BASE_URLS["docs"], max_pages=5)
+        print("Scraping Atlan documentation and developer hub...")
+        docs_content, dev_content = asyncio.run(self._scrape_sites(
+            [KNOWLEDGE_BASE_URLS["docs"], KNOWLEDGE_BASE_URLS["developer"]], max_pages=5
+        ))
         all_content.extend(docs_content)
-        
-        print("Scraping developer hub...")
-        dev_content = self.scrape_documentation(KNOWLEDGE_BASE_URLS["developer"], max_pages=5)
         all_content.extend(dev_content)
         
         print("Creating embeddings...")
-        self.create_embeddings(all_content)
+        self.create_embeddings(all_content, stored_embeddings)
+        self.save_cache()
         
-        print(f"Knowledge base initialized with {len(self.embeddings)} documents.")
+        print(f"Knowledge base initialized with {len(self.documents)} documents.")
 
 if __name__ == "__main__":
     kb = KnowledgeBase()
@@ -0,0 +1,161 @@
+import asyncio
+import random
+import time
+import openai
+import tiktoken
+from typing import Any, Dict, List, Optional
+
+class ParallelRequestProcessor:
+    def __init__(self, client: openai.AsyncOpenAI, max_requests_per_minute: float, max_tokens_per_minute: float,
+                 max_concurrent: int, max_attempts: int = 5, base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.client = client
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.max_concurrent = max_concurrent
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self.available_request_capacity = max_requests_per_minute
+        self.available_token_capacity = max_tokens_per_minute
+        self._last_update_time = time.monotonic()
+        self._paused_until = 0.0
+        self._encodings = {}
+    
+    async def process(self, requests: List[Dict]) -> List[Any]:
+        results: List[Any] = [None] * len(requests)
+        if not requests:
+            return results
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, request in enumerate(requests):
+            queue.put_nowait((index, request))
+        
+        capacity_lock = asyncio.Lock()
+        workers = [
+            asyncio.create_task(self._worker(queue, results, capacity_lock))
+            for _ in range(min(self.max_concurrent, len(requests)))
+        ]
+        
+        await queue.join()
+        
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        return results
+    
+    async def _worker(self, queue: asyncio.Queue, results: List[Any], capacity_lock: asyncio.Lock) -> None:
+        while True:
+            index, request = await queue.get()
+            try:
+                results[index] = await self._dispatch(request, capacity_lock)
+            except Exception as e:
+                results[index] = e
+            finally:
+                queue.task_done()
+    
+    async def _dispatch(self, request: Dict, capacity_lock: asyncio.Lock) -> Any:
+        token_estimate = self._estimate_tokens(request)
+        
+        for attempt in range(1, self.max_attempts + 1):
+            await self._acquire_capacity(token_estimate, capacity_lock)
+            
+            try:
+                raw_response = await self.client.chat.completions.with_raw_response.create(**request)
+                self._update_capacity_from_headers(raw_response.headers)
+                return raw_response.parse()
+            
+            except openai.RateLimitError as e:
+                retry_after = self._get_retry_after(e.response.headers)
+                delay = retry_after if retry_after is not None else self._get_backoff(attempt)
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                if attempt == self.max_attempts:
+                    raise
+                print(f"Rate limited, retrying in {delay:.1f}s (attempt {attempt}/{self.max_attempts})")
+            
+            except (openai.APIStatusError, openai.APIConnectionError) as e:
+                status_code = getattr(e, "status_code", None)
+                if (status_code is not None and status_code < 500) or attempt == self.max_attempts:
+                    raise
+                delay = self._get_backoff(attempt)
+                print(f"Request failed ({e}), retrying in {delay:.1f}s (attempt {attempt}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+    
+    async def _acquire_capacity(self, token_estimate: int, capacity_lock: asyncio.Lock) -> None:
+        token_estimate = min(token_estimate, self.max_tokens_per_minute)
+        
+        while True:
+            async with capacity_lock:
+                self._refill_capacity()
+                wait_time = self._paused_until - time.monotonic()
+                
+                if (wait_time <= 0 and
+                    self.available_request_capacity >= 1 and
+                    self.available_token_capacity >= token_estimate):
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= token_estimate
+                    return
+            
+            await asyncio.sleep(max(wait_time, 0.05))
+    
+    def _refill_capacity(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_update_time
+        self._last_update_time = now
+        
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60.0,
+            self.max_requests_per_minute
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60.0,
+            self.max_tokens_per_minute
+        )
+    
+    def _update_capacity_from_headers(self, headers) -> None:
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        
+        try:
+            if remaining_requests is not None:
+                self.available_request_capacity = min(self.available_request_capacity, float(remaining_requests))
+            if remaining_tokens is not None:
+                self.available_token_capacity = min(self.available_token_capacity, float(remaining_tokens))
+        except ValueError:
+            pass
+    
+    def _get_retry_after(self, headers) -> Optional[float]:
+        try:
+            retry_after_ms = headers.get("retry-after-ms")
+            if retry_after_ms is not None:
+                return float(retry_after_ms) / 1000.0
+            
+            retry_after = headers.get("retry-after")
+            if retry_after is not None:
+                return float(retry_after)
+        except ValueError:
+            pass
+        
+        return None
+    
+    def _get_backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+    
+    def _estimate_tokens(self, request: Dict) -> int:
+        encoding = self._get_encoding(request.get("model", ""))
+        
+        prompt_tokens = 2
+        for message in request.get("messages", []):
+            prompt_tokens += 4 + len(encoding.encode(message.get("content") or ""))
+        
+        return prompt_tokens + request.get("max_tokens", 0)
+    
+    def _get_encoding(self, model: str):
+        if model not in self._encodings:
+            try:
+                self._encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encodings[model] = tiktoken.get_encoding("cl100k_base")
+        
+        return self._encodings[model]